@@ -0,0 +1 @@
+default_app_config = 'openedx.core.djangoapps.user_api.apps.UserAPIConfig'
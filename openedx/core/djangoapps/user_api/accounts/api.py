@@ -7,6 +7,7 @@ from pytz import UTC
 
 from django.utils.translation import override as override_language, ugettext as _
 from django.db import transaction, IntegrityError
+from django.db.models import Prefetch
 from django.core.exceptions import ObjectDoesNotExist
 from django.conf import settings
 from django.core.validators import validate_email, ValidationError
@@ -21,17 +22,19 @@ from util.password_policy_validators import validate_password
 
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from openedx.core.djangoapps.user_api import errors, accounts, forms, helpers
+from openedx.core.djangoapps.user_api.accounts import ACCOUNT_VISIBILITY_PREF_KEY
 from openedx.core.djangoapps.user_api.config.waffle import PREVENT_AUTH_USER_WRITES, SYSTEM_MAINTENANCE_MSG, waffle
 from openedx.core.djangoapps.user_api.errors import (
     AccountUpdateError,
     AccountValidationError,
     PreferenceValidationError,
 )
+from openedx.core.djangoapps.user_api.models import UserPreference
 from openedx.core.djangoapps.user_api.preferences.api import update_user_preferences
 from openedx.core.lib.api.view_utils import add_serializer_errors
 
 from .serializers import (
-    AccountLegacyProfileSerializer, AccountUserSerializer,
+    PREFETCHED_VISIBILITY_PREFERENCES_ATTR, AccountLegacyProfileSerializer, AccountUserSerializer,
     UserReadOnlySerializer, _visible_fields  # pylint: disable=invalid-name
 )
 
@@ -76,19 +79,78 @@ def get_account_settings(request, usernames=None, configuration=None, view=None)
     if not requested_users:
         raise errors.UserNotFound()
 
+    return serialize_account_settings(request, requested_users, configuration, view)
+
+
+@helpers.intercept_errors(errors.UserAPIInternalError, ignore_errors=[errors.UserAPIRequestError])
+def get_account_settings_bulk(request, usernames, configuration=None, view=None):
+    """Returns account information for several users serialized as JSON.
+
+    Unlike `get_account_settings`, the related data needed to serialize the accounts (language
+    proficiencies, social links and account privacy preferences) is fetched up front, using a
+    constant number of queries regardless of the number of users requested.
+
+    Args:
+        request (Request): The request object with account information about the requesting user.
+        usernames (list): The usernames for the desired account information.
+        configuration (dict): an optional configuration specifying which fields in the account
+            can be shared, and the default visibility settings.
+        view (str): An optional string allowing "is_staff" users and users requesting their own
+            account information to get just the fields that are shared with everyone.
+
+    Returns:
+         A list of users account details.
+
+    Raises:
+         errors.UserNotFound: no user with any of the `usernames` exists.
+         errors.UserAPIInternalError: the operation failed due to an unexpected error.
+
+    """
+    requested_users = User.objects.select_related('profile').filter(username__in=usernames).prefetch_related(
+        'profile__language_proficiencies',
+        'profile__social_links',
+        Prefetch(
+            'preferences',
+            queryset=UserPreference.objects.filter(key=ACCOUNT_VISIBILITY_PREF_KEY),
+            to_attr=PREFETCHED_VISIBILITY_PREFERENCES_ATTR,
+        ),
+    )
+    if not requested_users:
+        raise errors.UserNotFound()
+
+    return serialize_account_settings(request, requested_users, configuration, view)
+
+
+def serialize_account_settings(request, users, configuration=None, view=None):
+    """Serializes the account information of already loaded users as JSON.
+
+    Args:
+        request (Request): The request object with account information about the requesting user.
+        users (iterable): The User objects to serialize, ideally with their profiles loaded.
+        configuration (dict): an optional configuration specifying which fields in the account
+            can be shared, and the default visibility settings.
+        view (str): An optional string allowing "is_staff" users and users requesting their own
+            account information to get just the fields that are shared with everyone.
+
+    Returns:
+         A list of users account details.
+
+    """
+    requesting_user = request.user
     serialized_users = []
-    for user in requested_users:
+    for user in users:
         has_full_access = requesting_user.is_staff or requesting_user.username == user.username
         if has_full_access and view != 'shared':
             admin_fields = settings.ACCOUNT_VISIBILITY_CONFIGURATION.get('admin_fields')
         else:
             admin_fields = None
+        # Call to_representation directly rather than going through `.data`, which would copy every
+        # serialized account into a ReturnDict that is never used as such.
         serialized_users.append(UserReadOnlySerializer(
-            user,
             configuration=configuration,
             custom_fields=admin_fields,
             context={'request': request}
-        ).data)
+        ).to_representation(user))
 
     return serialized_users
 
@@ -121,6 +183,10 @@ def update_account_settings(requesting_user, update, username=None):
             but then the e-mail change request, which is processed last, may throw an error.
         errors.UserAPIInternalError: the operation failed due to an unexpected error.
 
+    Returns:
+        User: the updated user, with its updated profile loaded, which can be passed to
+            `serialize_account_settings` without fetching the account again.
+
     """
     if username is None:
         username = requesting_user.username
@@ -266,6 +332,10 @@ def update_account_settings(requesting_user, update, username=None):
                 user_message=text_type(err)
             )
 
+    # Make the updated profile available to callers serializing the user.
+    existing_user.profile = existing_user_profile
+    return existing_user
+
 
 @helpers.intercept_errors(errors.UserAPIInternalError, ignore_errors=[errors.UserAPIRequestError])
 @transaction.atomic
@@ -0,0 +1,93 @@
+"""
+Caching of serialized user account information.
+
+Rather than deleting every cached variant of a user's account individually,
+each cache key embeds a per-user version token which is replaced whenever the
+user's account information changes.
+"""
+import hashlib
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import quote_etag
+
+# Number of seconds serialized account information is cached for.
+ACCOUNT_SETTINGS_CACHE_TIMEOUT = 300
+# Number of seconds version tokens are kept for. A version token is created for any
+# username requested, existing or not, so it must expire. Once it has, a new token
+# is created, which only orphans the entries cached under the previous one.
+ACCOUNT_SETTINGS_VERSION_CACHE_TIMEOUT = 24 * 60 * 60
+
+ACCOUNT_SETTINGS_CACHE_KEY_TPL = u'accounts.settings.{username}.{version}.{access}.{base_url}'
+ACCOUNT_SETTINGS_VERSION_CACHE_KEY_TPL = u'accounts.settings.version.{username}'
+
+
+def get_account_settings_cache_key(request, username, view=None):
+    """
+    Returns the key under which the account information of `username`, as serialized
+    for the user making `request`, is cached.
+
+    The serialized data only depends on whether the requesting user has full access
+    to the account (see `get_account_settings`) and on the URL the request was made
+    to, so the key is shared by all requesting users with the same level of access.
+
+    Returns None if the cache does not keep the user's version token, as is the
+    case of dummy caches, since cached account information could then never be
+    invalidated.
+    """
+    version = _get_account_settings_version(username)
+    if version is None:
+        return None
+
+    requesting_user = request.user
+    has_full_access = requesting_user.is_staff or requesting_user.username == username
+    return ACCOUNT_SETTINGS_CACHE_KEY_TPL.format(
+        username=username,
+        version=version,
+        access='full' if has_full_access and view != 'shared' else 'shared',
+        base_url=request.build_absolute_uri('/'),
+    )
+
+
+def get_account_settings_etag(cache_key):
+    """
+    Returns the entity tag of the account information cached under `cache_key`.
+
+    Since the cache key changes whenever the account information does, it
+    identifies the serialized representation without having to build it. The
+    tag is weak because the representation still depends on content negotiation.
+    """
+    return u'W/{}'.format(quote_etag(hashlib.md5(cache_key.encode('utf-8')).hexdigest()))
+
+
+def invalidate_account_settings_cache(username):
+    """
+    Invalidates all cached account information of `username` once the current
+    transaction, if any, is committed.
+
+    Invalidating any earlier would let a concurrent request cache the account
+    information it still reads from before the commit under the new version.
+    """
+    transaction.on_commit(lambda: _set_account_settings_version(username))
+
+
+def _set_account_settings_version(username):
+    """
+    Replaces the version token of the cached account information of `username`.
+    """
+    cache.set(
+        ACCOUNT_SETTINGS_VERSION_CACHE_KEY_TPL.format(username=username),
+        uuid4().hex,
+        ACCOUNT_SETTINGS_VERSION_CACHE_TIMEOUT
+    )
+
+
+def _get_account_settings_version(username):
+    """
+    Returns the current version token of the cached account information of `username`.
+    """
+    version_key = ACCOUNT_SETTINGS_VERSION_CACHE_KEY_TPL.format(username=username)
+    # Use add() so that concurrent requests agree on a single initial version.
+    cache.add(version_key, uuid4().hex, ACCOUNT_SETTINGS_VERSION_CACHE_TIMEOUT)
+    return cache.get(version_key)
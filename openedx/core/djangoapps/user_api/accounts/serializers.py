@@ -3,6 +3,7 @@ Django REST Framework serializers for the User API Accounts sub-application
 """
 import json
 import logging
+from operator import attrgetter
 
 from rest_framework import serializers
 from django.contrib.auth.models import User
@@ -26,6 +27,8 @@ from .image_helpers import get_profile_image_urls_for_user
 from .utils import validate_social_link, format_social_link
 
 PROFILE_IMAGE_KEY_PREFIX = 'image_url'
+# Name of the User attribute that account privacy preferences are prefetched into, if any.
+PREFETCHED_VISIBILITY_PREFERENCES_ATTR = 'visibility_preferences'
 LOGGER = logging.getLogger(__name__)
 
 
@@ -126,9 +129,9 @@ class UserReadOnlySerializer(serializers.Serializer):
                     "profile_image": AccountLegacyProfileSerializer.get_profile_image(
                         user_profile, user, self.context.get('request')
                     ),
-                    "language_proficiencies": LanguageProficiencySerializer(
-                        user_profile.language_proficiencies.all(), many=True
-                    ).data,
+                    "language_proficiencies": _serialize_model_attributes(
+                        LanguageProficiencySerializer, user_profile.language_proficiencies.all()
+                    ),
                     "name": user_profile.name,
                     "gender": AccountLegacyProfileSerializer.convert_empty_to_None(user_profile.gender),
                     "goals": user_profile.goals,
@@ -139,9 +142,9 @@ class UserReadOnlySerializer(serializers.Serializer):
                     "mailing_address": user_profile.mailing_address,
                     "requires_parental_consent": user_profile.requires_parental_consent(),
                     "account_privacy": get_profile_visibility(user_profile, user, self.configuration),
-                    "social_links": SocialLinkSerializer(
-                        user_profile.social_links.all(), many=True
-                    ).data,
+                    "social_links": _serialize_model_attributes(
+                        SocialLinkSerializer, user_profile.social_links.all()
+                    ),
                     "extended_profile": get_extended_profile(user_profile),
                 }
             )
@@ -332,6 +335,30 @@ class AccountLegacyProfileSerializer(serializers.HyperlinkedModelSerializer, Rea
         return instance
 
 
+# Attribute getters of the serializers passed to _serialize_model_attributes, keyed by serializer class.
+_MODEL_ATTRIBUTE_GETTERS = {}
+
+
+def _serialize_model_attributes(serializer_class, instances):
+    """
+    Returns the representation of `instances` as serialized by `serializer_class`, a ModelSerializer
+    whose fields are all plain attributes of its model.
+
+    This is equivalent to `serializer_class(instances, many=True).data`, but skips building the
+    serializer's fields (which introspects the model) and DRF's per-field attribute lookups for every
+    account serialized, by reading the attributes through getters resolved once per serializer class.
+    """
+    getters = _MODEL_ATTRIBUTE_GETTERS.get(serializer_class)
+    if getters is None:
+        getters = _MODEL_ATTRIBUTE_GETTERS[serializer_class] = [
+            (field_name, attrgetter(field_name)) for field_name in serializer_class.Meta.fields
+        ]
+    return [
+        {field_name: getter(instance) for field_name, getter in getters}
+        for instance in instances
+    ]
+
+
 def get_extended_profile(user_profile):
     """Returns the extended user profile fields stored in user_profile.meta"""
 
@@ -360,9 +387,13 @@ def get_profile_visibility(user_profile, user, configuration=None):
     if not configuration:
         configuration = settings.ACCOUNT_VISIBILITY_CONFIGURATION
 
-    # Calling UserPreference directly because the requesting user may be different from existing_user
-    # (and does not have to be is_staff).
-    profile_privacy = UserPreference.get_value(user, ACCOUNT_VISIBILITY_PREF_KEY)
+    prefetched_preferences = getattr(user, PREFETCHED_VISIBILITY_PREFERENCES_ATTR, None)
+    if prefetched_preferences is not None:
+        profile_privacy = prefetched_preferences[0].value if prefetched_preferences else None
+    else:
+        # Calling UserPreference directly because the requesting user may be different from existing_user
+        # (and does not have to be is_staff).
+        profile_privacy = UserPreference.get_value(user, ACCOUNT_VISIBILITY_PREF_KEY)
     return profile_privacy if profile_privacy else configuration.get('default_visibility')
 
 
@@ -2,6 +2,47 @@
 Django Signal related functionality for user_api accounts
 """
 
-from django.dispatch import Signal
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from student.models import UserProfile
+
+from ..models import UserPreference
+from .cache import invalidate_account_settings_cache
 
 USER_RETIRE_MAILINGS = Signal(providing_args=["user"])
+
+# Sent when a user's password and email are retired by the deactivate_logout endpoint. The user's
+# row is updated in place, so the User's post_save signal is not sent.
+USER_DEACTIVATED = Signal(providing_args=["user"])
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_account_settings(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the cached account information of a saved or deleted user.
+    """
+    invalidate_account_settings_cache(instance.username)
+
+
+@receiver(USER_DEACTIVATED)
+def invalidate_deactivated_user_account_settings(sender, user, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the cached account information of a deactivated user.
+    """
+    invalidate_account_settings_cache(user.username)
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+@receiver([post_save, post_delete], sender=UserPreference)
+def invalidate_user_related_account_settings(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the cached account information of the owner of a saved or deleted
+    profile or preference.
+
+    Language proficiencies and social links are only ever replaced while updating
+    their profile, which is then saved, so they need no receivers of their own.
+    Such receivers would also prevent Django from deleting them in bulk.
+    """
+    invalidate_account_settings_cache(instance.user.username)
@@ -12,19 +12,28 @@ from dateutil.parser import parse as parse_datetime
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core import mail
+from django.db import connection
 from django.test import TestCase
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from mock import Mock, patch
 from nose.plugins.attrib import attr
 from nose.tools import raises
 from six import iteritems
 
-from openedx.core.djangoapps.user_api.accounts import PRIVATE_VISIBILITY, USERNAME_MAX_LENGTH
+from openedx.core.djangoapps.user_api.accounts import (
+    ACCOUNT_VISIBILITY_PREF_KEY,
+    ALL_USERS_VISIBILITY,
+    PRIVATE_VISIBILITY,
+    USERNAME_MAX_LENGTH
+)
 from openedx.core.djangoapps.user_api.accounts.api import (
     activate_account,
     create_account,
     get_account_settings,
+    get_account_settings_bulk,
     request_password_change,
+    serialize_account_settings,
     update_account_settings
 )
 from openedx.core.djangoapps.user_api.accounts.tests.testutils import (
@@ -34,6 +43,7 @@ from openedx.core.djangoapps.user_api.accounts.tests.testutils import (
     VALID_USERNAMES_UNICODE
 )
 from openedx.core.djangoapps.user_api.config.waffle import PREVENT_AUTH_USER_WRITES, SYSTEM_MAINTENANCE_MSG, waffle
+from openedx.core.djangoapps.user_api.preferences.api import set_user_preference
 from openedx.core.djangoapps.user_api.errors import (
     AccountEmailInvalid,
     AccountPasswordInvalid,
@@ -125,6 +135,30 @@ class TestAccountApi(UserSettingsEventTestMixin, TestCase):
         with self.assertRaises(UserNotFound):
             get_account_settings(request)
 
+    def test_get_bulk_matches_get(self):
+        """Test that get_account_settings_bulk serializes accounts the same way as get_account_settings."""
+        set_user_preference(self.different_user, ACCOUNT_VISIBILITY_PREF_KEY, ALL_USERS_VISIBILITY)
+        usernames = [self.user.username, self.different_user.username]
+        self.assertEqual(
+            sorted(get_account_settings(self.default_request, usernames), key=lambda account: account['username']),
+            sorted(get_account_settings_bulk(self.default_request, usernames), key=lambda account: account['username']),
+        )
+
+    def test_get_bulk_query_count(self):
+        """Test that the number of queries made by get_account_settings_bulk does not depend on the number of users."""
+        with CaptureQueriesContext(connection) as single_user_queries:
+            get_account_settings_bulk(self.default_request, [self.user.username])
+
+        other_users = UserFactory.create_batch(3)
+        usernames = [self.user.username] + [user.username for user in other_users]
+        with self.assertNumQueries(len(single_user_queries)):
+            self.assertEqual(len(get_account_settings_bulk(self.default_request, usernames)), 4)
+
+    def test_get_bulk_user_not_found(self):
+        """Test that UserNotFound is thrown if there is no user with any of the usernames."""
+        with self.assertRaises(UserNotFound):
+            get_account_settings_bulk(self.default_request, ["does_not_exist"])
+
     def test_update_username_provided(self):
         """Test the difference in behavior when a username is supplied to update_account_settings."""
         update_account_settings(self.user, {"name": "Mickey Mouse"})
@@ -138,6 +172,18 @@ class TestAccountApi(UserSettingsEventTestMixin, TestCase):
         with self.assertRaises(UserNotAuthorized):
             update_account_settings(self.different_user, {"name": "Pluto"}, username=self.user.username)
 
+    def test_update_returns_updated_user(self):
+        """Test that update_account_settings returns the updated user, which serializes like a fresh fetch."""
+        updated_user = update_account_settings(self.user, {"name": "Mickey Mouse", "goals": "Laugh"})
+        self.assertEqual(self.user, updated_user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual("Mickey Mouse", updated_user.profile.name)
+        self.assertEqual(
+            get_account_settings(self.default_request)[0],
+            serialize_account_settings(self.default_request, [updated_user])[0],
+        )
+
     def test_update_user_not_found(self):
         """Test that UserNotFound is thrown if there is no user with username."""
         with self.assertRaises(UserNotFound):
@@ -9,7 +9,11 @@ from testfixtures import LogCapture
 
 from student.models import UserProfile
 from student.tests.factories import UserFactory
-from openedx.core.djangoapps.user_api.accounts.serializers import UserReadOnlySerializer
+from openedx.core.djangoapps.user_api.accounts.serializers import (
+    LanguageProficiencySerializer,
+    SocialLinkSerializer,
+    UserReadOnlySerializer
+)
 
 
 LOGGER_NAME = "openedx.core.djangoapps.user_api.accounts.serializers"
@@ -56,3 +60,20 @@ class UserReadOnlySerializerTest(TestCase):
 
         self.assertEqual(data['username'], self.user.username)
         self.assertEqual(data['name'], None)
+
+    def test_related_data_matches_model_serializers(self):
+        """
+        Test language proficiencies and social links are serialized as their model serializers would.
+        """
+        profile = UserProfile.objects.create(user=self.user, name='test name')
+        profile.language_proficiencies.create(code='en')
+        profile.language_proficiencies.create(code='fr')
+        profile.social_links.create(platform='facebook', social_link='https://www.facebook.com/test_user')
+        config = dict(self.config, public_fields=['language_proficiencies', 'social_links'])
+
+        data = UserReadOnlySerializer(self.user, configuration=config, context={'request': self.request}).data
+        self.assertEqual(
+            data['language_proficiencies'],
+            LanguageProficiencySerializer(profile.language_proficiencies.all(), many=True).data
+        )
+        self.assertEqual(data['social_links'], SocialLinkSerializer(profile.social_links.all(), many=True).data)
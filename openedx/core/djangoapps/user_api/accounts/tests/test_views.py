@@ -13,6 +13,8 @@ import pytest
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
+from django.db import DatabaseError
+from django.db.models.signals import post_save
 from django.test import TestCase
 from django.test.testcases import TransactionTestCase
 from django.test.utils import override_settings
@@ -24,7 +26,8 @@ from rest_framework.test import APIClient, APITestCase
 from social_django.models import UserSocialAuth
 
 from openedx.core.djangoapps.user_api.accounts import ACCOUNT_VISIBILITY_PREF_KEY
-from openedx.core.djangoapps.user_api.accounts.signals import USER_RETIRE_MAILINGS
+from openedx.core.djangoapps.user_api.accounts.signals import USER_DEACTIVATED, USER_RETIRE_MAILINGS
+from openedx.core.djangoapps.user_api.accounts.views import INTERNAL_ERROR_MESSAGE, MAX_USERNAME_BATCH
 from openedx.core.djangoapps.user_api.models import UserPreference, UserOrgTag
 from openedx.core.djangoapps.user_api.preferences.api import set_user_preference
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
@@ -223,6 +226,13 @@ class TestAccountsAPI(CacheIsolationTestCase, UserAPITestCase):
 
         self.url = reverse("accounts_api", kwargs={'username': self.user.username})
 
+        # The test's transaction is never committed, so invalidate cached account information immediately.
+        patcher = patch(
+            'openedx.core.djangoapps.user_api.accounts.cache.transaction.on_commit', lambda func: func()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def _verify_full_shareable_account_response(self, response, account_privacy=None, badges_enabled=False):
         """
         Verify that the shareable fields from the account are returned
@@ -428,6 +438,118 @@ class TestAccountsAPI(CacheIsolationTestCase, UserAPITestCase):
         for empty_field in ("level_of_education", "gender", "country", "bio"):
             self.assertIsNone(response.data[empty_field])
 
+    def test_get_account_cached(self):
+        """
+        Test that account information is served from the cache until the account changes.
+        """
+        self.client.login(username=self.user.username, password=TEST_PASSWORD)
+        response = self.send_get(self.client)
+
+        with patch('openedx.core.djangoapps.user_api.accounts.views.get_account_settings') as mock_get_settings:
+            cached_response = self.send_get(self.client)
+        self.assertFalse(mock_get_settings.called)
+        self.assertEqual(response.data, cached_response.data)
+
+        legacy_profile = UserProfile.objects.get(id=self.user.id)
+        legacy_profile.goals = "Cache invalidation"
+        legacy_profile.save()
+        response = self.send_get(self.client)
+        self.assertEqual("Cache invalidation", response.data["goals"])
+
+    def test_get_account_without_version(self):
+        """
+        Test that no ETag is returned when the cache does not keep account versions.
+        """
+        self.client.login(username=self.user.username, password=TEST_PASSWORD)
+        with patch(
+            'openedx.core.djangoapps.user_api.accounts.cache._get_account_settings_version', return_value=None
+        ):
+            response = self.send_get(self.client)
+        self.assertNotIn('ETag', response)
+
+    def test_get_account_not_cached_for_other_username_spelling(self):
+        """
+        Test that account information found under a username spelled differently than the
+        account's, as case insensitive database collations allow, is not cached.
+        """
+        self.client.login(username=self.user.username, password=TEST_PASSWORD)
+        url = reverse("accounts_api", kwargs={'username': self.user.username.upper()})
+
+        with patch(
+            'openedx.core.djangoapps.user_api.accounts.views.get_account_settings',
+            return_value=[{'username': self.user.username}]
+        ) as mock_get_settings:
+            for _ in range(2):
+                response = self.client.get(url)
+                self.assertEqual(200, response.status_code)
+                self.assertNotIn('ETag', response)
+        self.assertEqual(2, mock_get_settings.call_count)
+
+    def test_get_account_not_modified(self):
+        """
+        Test that conditional GETs return a 304 until the account changes.
+        """
+        self.client.login(username=self.user.username, password=TEST_PASSWORD)
+        etag = self.send_get(self.client)['ETag']
+
+        with patch('openedx.core.djangoapps.user_api.accounts.views.get_account_settings') as mock_get_settings:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(etag, response['ETag'])
+        self.assertFalse(mock_get_settings.called)
+
+        legacy_profile = UserProfile.objects.get(id=self.user.id)
+        legacy_profile.goals = "Cache invalidation"
+        legacy_profile.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response['ETag'])
+
+    @patch.dict(getattr(settings, "ACCOUNT_VISIBILITY_CONFIGURATION", {}), {"default_visibility": "private"})
+    def test_get_account_cached_per_access_level(self):
+        """
+        Test that full account information cached for the owner is not returned to other users.
+        """
+        self.client.login(username=self.user.username, password=TEST_PASSWORD)
+        self.assertEqual(19, len(self.send_get(self.client).data))
+
+        self.different_client.login(username=self.different_user.username, password=TEST_PASSWORD)
+        self._verify_private_account_response(
+            self.send_get(self.different_client), requires_parental_consent=True, account_privacy=PRIVATE_VISIBILITY
+        )
+
+    def test_get_accounts_list(self):
+        """
+        Test that several accounts can be requested at once, ignoring duplicate and empty usernames.
+        """
+        client = self.login_client("staff_client", "staff_user")
+        usernames = [self.user.username, self.different_user.username]
+        response = client.get(
+            reverse("accounts_detail_api"),
+            {'username': u'{0}, {1},{0},'.format(*usernames)}
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(sorted(usernames), sorted(account["username"] for account in response.data))
+
+    @ddt.data(u',', u' ', u'')
+    def test_get_accounts_list_no_usernames(self, usernames):
+        """
+        Test that requesting a list of accounts without any usernames does not return the requesting user's.
+        """
+        client = self.login_client("client", "user")
+        response = client.get(reverse("accounts_detail_api"), {'username': usernames})
+        self.assertEqual(404, response.status_code)
+
+    def test_get_accounts_list_too_many_usernames(self):
+        """
+        Test that requesting more than MAX_USERNAME_BATCH accounts at once returns a 400.
+        """
+        client = self.login_client("staff_client", "staff_user")
+        usernames = [u'user{}'.format(index) for index in range(MAX_USERNAME_BATCH + 1)]
+        response = client.get(reverse("accounts_detail_api"), {'username': u','.join(usernames)})
+        self.assertEqual(400, response.status_code)
+        self.assertIn("developer_message", response.data)
+
     @ddt.data(
         ("different_client", "different_user"),
         ("staff_client", "staff_user"),
@@ -841,6 +963,7 @@ class TestAccountAPITransactions(TransactionTestCase):
         self.assertEqual(u"m", data["gender"])
 
 
+@ddt.ddt
 @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Account APIs are only supported in LMS')
 class TestAccountDeactivation(TestCase):
     """
@@ -911,6 +1034,52 @@ class TestAccountDeactivation(TestCase):
             expected_activation_status=True
         )
 
+    def test_deactivation_response(self):
+        """
+        Verify the deactivation endpoint only returns the full account information when asked to.
+        """
+        headers = self.build_jwt_headers(SuperuserFactory())
+        response = self.client.post(self.url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'username': self.test_user.username})
+
+        response = self.client.post(self.url + '?verbose=1', **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['username'], self.test_user.username)
+        self.assertEqual(response.data['email'], self.test_user.email)
+
+    def test_deactivation_settings_changed_events(self):
+        """
+        Verify deactivating a user emits the settings changed event of their password.
+        """
+        headers = self.build_jwt_headers(SuperuserFactory())
+        with patch('openedx.core.djangoapps.user_api.accounts.views.emit_setting_changed_event') as mock_emit:
+            response = self.client.post(self.url, **headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_emit.call_count, 1)
+        self.assertEqual(mock_emit.call_args[0][1:], ('auth_user', 'password', None, None))
+        self.assertEqual(mock_emit.call_args[0][0].id, self.test_user.id)
+
+    @ddt.data('0', 'false', 'False', '')
+    def test_deactivation_response_not_verbose(self, verbose):
+        """
+        Verify the deactivation endpoint only returns the username when the "verbose" URL parameter is false.
+        """
+        headers = self.build_jwt_headers(SuperuserFactory())
+        response = self.client.post(self.url + '?verbose=' + verbose, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'username': self.test_user.username})
+
+    def test_nonexistent_user(self):
+        """
+        Verify that trying to deactivate a nonexistent user returns a 404.
+        """
+        headers = self.build_jwt_headers(SuperuserFactory())
+        url = reverse('accounts_deactivation', kwargs={'username': 'made_up_username'})
+        response = self.client.post(url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_on_jwt_headers_rejection(self):
         """
         Verify users who are not JWT authenticated are rejected.
@@ -1015,7 +1184,45 @@ class TestAccountRetireMailings(TestCase):
         finally:
             USER_RETIRE_MAILINGS.disconnect(mock_handler)
 
+    def test_nonexistent_user(self):
+        """
+        Verify that retiring the mailings of a nonexistent user returns a 404.
+        """
+        headers = self.build_jwt_headers(self.test_superuser)
+        url = reverse('accounts_retire_mailings', kwargs={'username': 'made_up_username'})
+        retired_username = get_retired_username_by_username('made_up_username')
+
+        response = self.client.post(url, {'retired_username': retired_username}, **headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    @override_settings(DEBUG=False)
+    def test_opt_out_database_error(self):
+        """
+        Verify that database errors while opting the user out of org emails return a 500 without their details.
+        """
+        headers = self.build_jwt_headers(self.test_superuser)
+        with patch('openedx.core.djangoapps.user_api.preferences.api.UserOrgTag') as mock_user_org_tag:
+            mock_user_org_tag.objects.filter.return_value.update.side_effect = DatabaseError("Tango")
+            self.assert_status_and_tag_count(
+                headers,
+                expected_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                expected_tag_value="True",
+                expected_content=INTERNAL_ERROR_MESSAGE
+            )
+
+    def test_mismatched_retired_username(self):
+        """
+        Verify that a retired username which is not a hash of the username returns a 400 explaining why.
+        """
+        headers = self.build_jwt_headers(self.test_superuser)
+        response = self.client.post(self.url, {'retired_username': 'made_up_username'}, **headers)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.content.strip('"'), 'Mismatched hashed_username, bad salt?')
+        self.assertEqual(UserOrgTag.objects.filter(user=self.test_user, value="True").count(), 2)
+
+
+@ddt.ddt
 @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Account APIs are only supported in LMS')
 class TestDeactivateLogout(TestCase):
     """
@@ -1065,6 +1272,67 @@ class TestDeactivateLogout(TestCase):
         self.assertFalse(updated_user.has_usable_password())
         self.assertEqual(list(UserSocialAuth.objects.filter(user=self.test_user)), [])
 
+    def test_deactivation_signals(self):
+        """
+        Verify deactivating a user sends USER_DEACTIVATED once instead of saving the user.
+        """
+        headers = self.build_jwt_headers(self.test_superuser)
+        mock_handler = MagicMock()
+        mock_post_save = MagicMock()
+        try:
+            USER_DEACTIVATED.connect(mock_handler)
+            post_save.connect(mock_post_save, sender=User)
+            response = self.client.post(self.url, self.build_post(self.test_user.username), **headers)
+        finally:
+            USER_DEACTIVATED.disconnect(mock_handler)
+            post_save.disconnect(mock_post_save, sender=User)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(mock_post_save.called)
+        self.assertEqual(mock_handler.call_count, 1)
+        deactivated_user = mock_handler.call_args[1]['user']
+        self.assertEqual(deactivated_user.email, get_retired_email_by_email(self.test_user.email))
+        self.assertFalse(deactivated_user.has_usable_password())
+        self.assertEqual(deactivated_user.password, User.objects.get(id=self.test_user.id).password)
+
+    def test_deactivation_settings_changed_events(self):
+        """
+        Verify deactivating a user emits the settings changed events of their email and password.
+        """
+        headers = self.build_jwt_headers(self.test_superuser)
+        original_email = self.test_user.email
+        with patch('openedx.core.djangoapps.user_api.accounts.views.emit_setting_changed_event') as mock_emit:
+            response = self.client.post(self.url, self.build_post(self.test_user.username), **headers)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            [call_args[0][1:] for call_args in mock_emit.call_args_list],
+            [
+                ('auth_user', 'email', original_email, get_retired_email_by_email(original_email)),
+                ('auth_user', 'password', None, None),
+            ]
+        )
+        self.assertEqual(mock_emit.call_args[0][0].id, self.test_user.id)
+
+    @ddt.data(
+        (False, INTERNAL_ERROR_MESSAGE),
+        (True, "Tango"),
+    )
+    @ddt.unpack
+    def test_database_error(self, debug, expected_content):
+        """
+        Verify database errors return a 500 which only includes the error's details in DEBUG mode.
+        """
+        headers = self.build_jwt_headers(self.test_superuser)
+        with override_settings(DEBUG=debug):
+            with patch(
+                'openedx.core.djangoapps.user_api.accounts.views._set_unusable_password',
+                side_effect=DatabaseError("Tango")
+            ):
+                response = self.client.post(self.url, self.build_post(self.test_user.username), **headers)
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.content.strip('"'), expected_content)
+
     def test_unauthorized_rejection(self):
         """
         Verify unauthorized users cannot deactivate other users.
@@ -4,9 +4,16 @@ An API for retrieving user account information.
 For additional information and historical context, see:
 https://openedx.atlassian.net/wiki/display/TNL/User+API
 """
+import re
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, UNUSABLE_PASSWORD_SUFFIX_LENGTH
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.utils.cache import get_conditional_response
+from django.utils.crypto import get_random_string
+from django.utils.translation import ugettext as _
 from edx_rest_framework_extensions.authentication import JwtAuthentication
 from rest_framework import permissions
 from rest_framework import status
@@ -16,20 +23,37 @@ from rest_framework.viewsets import ViewSet
 from six import text_type
 from social_django.models import UserSocialAuth
 
-from openedx.core.djangoapps.user_api.preferences.api import update_email_opt_in
+from openedx.core.djangoapps.user_api.preferences.api import update_email_opt_in_bulk
 from openedx.core.lib.api.authentication import (
     SessionAuthenticationAllowInactiveUser,
     OAuth2AuthenticationAllowInactiveUser,
 )
 from openedx.core.lib.api.parsers import MergePatchParser
-from student.models import User, get_potentially_retired_user_by_username_and_hash, get_retired_email_by_email
+from student.models import (
+    User,
+    get_all_retired_usernames_by_username,
+    get_potentially_retired_user_by_username_and_hash,
+    get_retired_email_by_email
+)
+from util.model_utils import emit_setting_changed_event
 
-from .api import get_account_settings, update_account_settings
+from .api import (
+    get_account_settings, get_account_settings_bulk, serialize_account_settings, update_account_settings
+)
+from .cache import ACCOUNT_SETTINGS_CACHE_TIMEOUT, get_account_settings_cache_key, get_account_settings_etag
 from .permissions import CanDeactivateUser, CanRetireUser
-from .signals import USER_RETIRE_MAILINGS
-from ..errors import UserNotFound, UserNotAuthorized, AccountUpdateError, AccountValidationError
+from .signals import USER_DEACTIVATED, USER_RETIRE_MAILINGS
+from ..errors import UserAPIInternalError, UserNotFound, UserNotAuthorized, AccountUpdateError, AccountValidationError
 from ..models import UserOrgTag
 
+# Maximum number of accounts that may be requested at once from the accounts list endpoint.
+MAX_USERNAME_BATCH = 50
+
+_split_usernames = re.compile(r'[,\s]+').split
+
+# Body of the error responses returned by the retirement endpoints when DEBUG is not enabled.
+INTERNAL_ERROR_MESSAGE = u'An internal error occurred.'
+
 
 class AccountViewSet(ViewSet):
     """
@@ -60,6 +84,9 @@ class AccountViewSet(ViewSet):
             If no user exists with the specified username, an HTTP 404 "Not
             Found" response is returned.
 
+            If more than 50 usernames are requested at once, an HTTP 400 "Bad
+            Request" response is returned.
+
             If the user makes the request for her own account, or makes a
             request for another account and has "is_staff" access, an HTTP 200
             "OK" response is returned. The response contains the following
@@ -185,13 +212,25 @@ class AccountViewSet(ViewSet):
         GET /api/user/v1/accounts?username={username1,username2}
         """
         usernames = request.GET.get('username')
+        if usernames is None:
+            usernames = [request.user.username]
+        else:
+            # Drop empty and duplicate usernames.
+            usernames = list(set(_split_usernames(usernames)) - {''})
+            if len(usernames) > MAX_USERNAME_BATCH:
+                return Response(
+                    {
+                        "developer_message": u"At most {} usernames may be requested at once.".format(
+                            MAX_USERNAME_BATCH
+                        ),
+                        "user_message": _(u"Too many usernames were requested."),
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
         try:
-            if usernames:
-                usernames = usernames.strip(',').split(',')
-            account_settings = get_account_settings(
-                request, usernames, view=request.query_params.get('view'))
+            account_settings = get_account_settings_bulk(request, usernames, view=request.query_params.get('view'))
         except UserNotFound:
-            return Response(status=status.HTTP_403_FORBIDDEN if request.user.is_staff else status.HTTP_404_NOT_FOUND)
+            return _forbidden_or_not_found_response(request.user)
 
         return Response(account_settings)
 
@@ -199,13 +238,32 @@ class AccountViewSet(ViewSet):
         """
         GET /api/user/v1/accounts/{username}/
         """
+        view = request.query_params.get('view')
+        cache_key = get_account_settings_cache_key(request, username, view)
+        if cache_key is not None:
+            etag = get_account_settings_etag(cache_key)
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified['ETag'] = etag
+                return not_modified
+
+            account_settings = cache.get(cache_key)
+            if account_settings is not None:
+                return _tagged_response(account_settings, etag)
+
         try:
-            account_settings = get_account_settings(
-                request, [username], view=request.query_params.get('view'))
+            account_settings = get_account_settings(request, [username], view=view)[0]
         except UserNotFound:
-            return Response(status=status.HTTP_403_FORBIDDEN if request.user.is_staff else status.HTTP_404_NOT_FOUND)
+            return _forbidden_or_not_found_response(request.user)
+
+        if cache_key is None or account_settings.get('username') != username:
+            # Also, usernames may be looked up case insensitively by the database. Both the cache
+            # key's access level and its invalidation rely on the account's exact username, so the
+            # account information must not be cached or tagged under any other spelling.
+            return Response(account_settings)
 
-        return Response(account_settings[0])
+        cache.set(cache_key, account_settings, ACCOUNT_SETTINGS_CACHE_TIMEOUT)
+        return _tagged_response(account_settings, etag)
 
     def partial_update(self, request, username):
         """
@@ -217,10 +275,9 @@ class AccountViewSet(ViewSet):
         """
         try:
             with transaction.atomic():
-                update_account_settings(request.user, request.data, username=username)
-                account_settings = get_account_settings(request, [username])[0]
+                updated_user = update_account_settings(request.user, request.data, username=username)
         except UserNotAuthorized:
-            return Response(status=status.HTTP_403_FORBIDDEN if request.user.is_staff else status.HTTP_404_NOT_FOUND)
+            return _forbidden_or_not_found_response(request.user)
         except UserNotFound:
             return Response(status=status.HTTP_404_NOT_FOUND)
         except AccountValidationError as err:
@@ -234,7 +291,9 @@ class AccountViewSet(ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        return Response(account_settings)
+        # Serialize the account once the transaction is committed, so that its row locks are not held
+        # while the account's related data is read.
+        return Response(serialize_account_settings(request, [updated_user])[0])
 
 
 class AccountDeactivationView(APIView):
@@ -247,12 +306,28 @@ class AccountDeactivationView(APIView):
 
     def post(self, request, username):
         """
-        POST /api/user/v1/accounts/{username}/deactivate/
+        POST /api/user/v1/accounts/{username}/deactivate/[?verbose=1]
 
         Marks the user as having no password set for deactivation purposes.
+
+        Returns the username of the deactivated user, or all of their account
+        information if the "verbose" URL parameter is "1" or "true". If no user exists
+        with the specified username, an HTTP 404 "Not Found" response is returned.
         """
-        _set_unusable_password(User.objects.get(username=username))
-        return Response(get_account_settings(request, [username])[0])
+        try:
+            # Only load the fields needed by the settings changed event
+            user = User.objects.only('id', 'username').get(username=username)
+        except User.DoesNotExist:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        _set_unusable_password(User.objects.filter(pk=user.id))
+        # Emit the settings changed event the User's post_save signal would have
+        user_table = User._meta.db_table  # pylint: disable=protected-access
+        emit_setting_changed_event(user, user_table, 'password', None, None)
+
+        if request.query_params.get('verbose', '').lower() in ('1', 'true'):
+            return Response(get_account_settings(request, [username])[0])
+        return Response({'username': username})
 
 
 class AccountRetireMailingsView(APIView):
@@ -275,20 +350,35 @@ class AccountRetireMailingsView(APIView):
         user_model = get_user_model()
         retired_username = request.data['retired_username']
 
+        # Reject retired usernames hashed with a salt that isn't configured here before
+        # looking the user up, which would otherwise raise a bare exception
+        if retired_username not in get_all_retired_usernames_by_username(username):
+            return Response(u'Mismatched hashed_username, bad salt?', status=status.HTTP_400_BAD_REQUEST)
+
         try:
             user = get_potentially_retired_user_by_username_and_hash(username, retired_username)
+        except user_model.DoesNotExist:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        except DatabaseError as exc:
+            return _internal_error_response(exc)
 
+        try:
             with transaction.atomic():
-                # Take care of org emails first, using the existing API for consistency
-                for preference in UserOrgTag.objects.filter(user=user, key='email-optin'):
-                    update_email_opt_in(user, preference.org, False)
+                # Take care of org emails first, opting out of all of them with a single update
+                orgs = list(UserOrgTag.objects.filter(user=user, key='email-optin').values_list('org', flat=True))
+                update_email_opt_in_bulk(user, orgs, False)
 
                 # This signal allows lms' email_marketing and other 3rd party email
-                # providers to unsubscribe the user as well
+                # providers to unsubscribe the user as well. Their receivers run
+                # synchronously so that the retirement pipeline is told whether
+                # the user was actually unsubscribed.
                 USER_RETIRE_MAILINGS.send(sender=self.__class__, user=user)
-        except user_model.DoesNotExist:
-            return Response(status=status.HTTP_404_NOT_FOUND)
+        except (DatabaseError, UserAPIInternalError) as exc:
+            # The user API wraps the database errors it runs into in UserAPIInternalErrors
+            return _internal_error_response(exc)
         except Exception as exc:  # pylint: disable=broad-except
+            # The signal's receivers report failures to unsubscribe the user with
+            # bare exceptions, whose message the retirement pipeline relies on.
             return Response(text_type(exc), status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -348,29 +438,86 @@ class DeactivateLogoutView(APIView):
 
         user_model = get_user_model()
         try:
-            # make sure the specified user exists
-            user = user_model.objects.get(username=username)
+            # make sure the specified user exists, only loading the fields needed to deactivate them
+            user = user_model.objects.only('id', 'username', 'email').get(username=username)
 
             with transaction.atomic():
-                # 1. Unlink LMS social auth accounts
-                UserSocialAuth.objects.filter(user_id=user.id).delete()
-                # 2. Change LMS password & email
-                user.email = get_retired_email_by_email(user.email)
-                user.save()
-                _set_unusable_password(user)
+                # 1. Unlink LMS social auth accounts. Nothing references UserSocialAuth rows or listens for
+                # their deletion, so skip the deletion collector and issue a single DELETE.
+                social_auth_accounts = UserSocialAuth.objects.filter(user_id=user.id)
+                social_auth_accounts._raw_delete(social_auth_accounts.db)  # pylint: disable=protected-access
+                # 2. Change LMS password & email, with a single UPDATE rather than saving the user
+                retired_email = get_retired_email_by_email(user.email)
+                unusable_password = _make_unusable_password()
+                _set_unusable_password(
+                    user_model.objects.filter(pk=user.id), password=unusable_password, email=retired_email
+                )
+                # Mirror the update on the instance passed to the signal's receivers
+                original_email = user.email
+                user.email = retired_email
+                user.password = unusable_password
+                # Emit the settings changed events the User's post_save signal would have
+                user_table = user_model._meta.db_table  # pylint: disable=protected-access
+                emit_setting_changed_event(user, user_table, 'email', original_email, retired_email)
+                emit_setting_changed_event(user, user_table, 'password', None, None)
+                USER_DEACTIVATED.send(sender=self.__class__, user=user)
                 # 3. Unlink social accounts & change password on each IDA, still to be implemented
         except user_model.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
-        except Exception as exc:  # pylint: disable=broad-except
-            return Response(text_type(exc), status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except DatabaseError as exc:
+            return _internal_error_response(exc)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-def _set_unusable_password(user):
+def _set_unusable_password(users, password=None, **fields):
+    """
+    Helper method for the shared functionality of setting the password of the
+    `users` queryset to the unusable password, thus deactivating the accounts.
+
+    The given unusable `password` is used if any, so that callers can mirror the
+    update on instances they hold. Any other `fields` given are updated as well.
+    This is done with a single UPDATE, without loading the users or sending
+    their save signals.
+
+    Returns the number of users updated.
+    """
+    return users.update(password=password or _make_unusable_password(), **fields)
+
+
+def _tagged_response(account_settings, etag):
+    """
+    Helper method returning a response with the given account information and its ETag.
+    """
+    response = Response(account_settings)
+    response['ETag'] = etag
+    return response
+
+
+def _forbidden_or_not_found_response(requesting_user):
+    """
+    Returns the response to a request for an account the requesting user may
+    not access, or which does not exist: staff are told they are forbidden from
+    accessing it, while other users cannot tell whether the account exists.
+    """
+    is_staff = getattr(requesting_user, 'is_staff', False)
+    return Response(status=status.HTTP_403_FORBIDDEN if is_staff else status.HTTP_404_NOT_FOUND)
+
+
+def _make_unusable_password():
     """
-    Helper method for the shared functionality of setting a user's
-    password to the unusable password, thus deactivating the account.
+    Returns a new unusable password, as `make_password(None)` would, without
+    going through the password hasher machinery.
     """
-    user.set_unusable_password()
-    user.save()
+    return UNUSABLE_PASSWORD_PREFIX + get_random_string(UNUSABLE_PASSWORD_SUFFIX_LENGTH)
+
+
+def _internal_error_response(exc):
+    """
+    Helper method returning an HTTP 500 "Internal Server Error" response for an
+    anticipated error, only including the error's details when DEBUG is enabled.
+    """
+    return Response(
+        text_type(exc) if settings.DEBUG else INTERNAL_ERROR_MESSAGE,
+        status=status.HTTP_500_INTERNAL_SERVER_ERROR
+    )
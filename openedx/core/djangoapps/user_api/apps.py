@@ -0,0 +1,15 @@
+"""
+Configuration for the User API Django app
+"""
+from django.apps import AppConfig
+
+
+class UserAPIConfig(AppConfig):
+    """
+    Default configuration for the "openedx.core.djangoapps.user_api" Django application.
+    """
+    name = u'openedx.core.djangoapps.user_api'
+
+    def ready(self):
+        # Register the signal handlers of the accounts sub-application.
+        from .accounts import signals  # pylint: disable=unused-variable
@@ -9,6 +9,7 @@ from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django_countries import countries
 from django.db import IntegrityError
+from django.utils.timezone import now
 from django.utils.translation import ugettext as _
 from django.utils.translation import ugettext_noop
 
@@ -271,6 +272,46 @@ def update_email_opt_in(user, org, opt_in):
         log.warning(u"Could not update organization wide preference due to IntegrityError: {}".format(text_type(err)))
 
 
+@intercept_errors(UserAPIInternalError, ignore_errors=[UserAPIRequestError])
+def update_email_opt_in_bulk(user, orgs, opt_in):
+    """Updates a user's existing preferences for receiving org-wide emails from several orgs at once.
+
+    Unlike `update_email_opt_in`, this does not create missing User Org Tags: all of the
+    user's existing email-optin tags for `orgs` are updated with a single query.
+
+    Arguments:
+        user (User): The user to set the preferences for.
+        orgs (list): The orgs whose email-optin tags should be updated.
+        opt_in (bool): True if the user is choosing to receive emails for these organizations.
+            If the user requires parental consent then email-optin is set to False regardless.
+
+    Returns:
+        None
+
+    Raises:
+         UserNotFound: no user profile exists for the specified user and `opt_in` is True.
+    """
+    if not orgs:
+        return
+
+    # If the user requires parental consent, then don't allow opt-in
+    if opt_in:
+        try:
+            user_profile = UserProfile.objects.get(user=user)
+        except ObjectDoesNotExist:
+            raise UserNotFound()
+        if user_profile.requires_parental_consent(
+            age_limit=getattr(settings, 'EMAIL_OPTIN_MINIMUM_AGE', 13),
+            default_requires_consent=False,
+        ):
+            opt_in = False
+
+    UserOrgTag.objects.filter(user=user, key='email-optin', org__in=orgs).update(value=str(opt_in), modified=now())
+    if hasattr(settings, 'LMS_SEGMENT_KEY') and settings.LMS_SEGMENT_KEY:
+        for org in orgs:
+            _track_update_email_opt_in(user.id, org, opt_in)
+
+
 def _track_update_email_opt_in(user_id, organization, opt_in):
     """Track an email opt-in preference change.
 
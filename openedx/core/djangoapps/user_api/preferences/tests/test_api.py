@@ -22,6 +22,7 @@ from xmodule.modulestore.tests.factories import CourseFactory
 
 from ...accounts.api import create_account
 from ...errors import (
+    UserAPIInternalError,
     UserNotFound,
     UserNotAuthorized,
     PreferenceValidationError,
@@ -36,6 +37,7 @@ from ...preferences.api import (
     update_user_preferences,
     delete_user_preference,
     update_email_opt_in,
+    update_email_opt_in_bulk,
     get_country_time_zones,
 )
 
@@ -424,6 +426,49 @@ class UpdateEmailOptInTests(ModuleStoreTestCase):
         result_obj = UserOrgTag.objects.get(user=user, org=course.id.org, key='email-optin')
         self.assertEqual(result_obj.value, expected_result)
 
+    @ddt.data(
+        # Check that a 27 year old can opt-out of several orgs at once
+        (27, False, u"False"),
+
+        # Check that a 32-year old can opt-in to several orgs at once
+        (32, True, u"True"),
+
+        # Check that someone 12 years old cannot opt-in to several orgs at once
+        (12, True, u"False")
+    )
+    @ddt.unpack
+    @override_settings(EMAIL_OPTIN_MINIMUM_AGE=13)
+    def test_update_email_optin_bulk(self, age, option, expected_result):
+        create_account(self.USERNAME, self.PASSWORD, self.EMAIL)
+
+        # Set year of birth
+        user = User.objects.get(username=self.USERNAME)
+        profile = UserProfile.objects.get(user=user)
+        profile.year_of_birth = datetime.datetime.now(utc).year - age
+        profile.save()
+
+        orgs = [u'foo', u'bar']
+        for org in orgs:
+            UserOrgTag.objects.create(user=user, org=org, key='email-optin', value=str(not option))
+
+        with self.assertNumQueries(2 if option else 1):
+            update_email_opt_in_bulk(user, orgs, option)
+
+        for org in orgs:
+            result_obj = UserOrgTag.objects.get(user=user, org=org, key='email-optin')
+            self.assertEqual(result_obj.value, expected_result)
+
+    def test_update_email_optin_bulk_no_orgs(self):
+        user = UserFactory()
+        with self.assertNumQueries(0):
+            update_email_opt_in_bulk(user, [], False)
+
+    @patch('openedx.core.djangoapps.user_api.preferences.api.UserOrgTag.objects.filter', side_effect=Exception)
+    def test_update_email_optin_bulk_internal_error(self, _filter):
+        user = UserFactory()
+        with self.assertRaises(UserAPIInternalError):
+            update_email_opt_in_bulk(user, [u'foo'], False)
+
     def _assert_is_datetime(self, timestamp):
         """
         Internal helper to assert the type of the provided timestamp value